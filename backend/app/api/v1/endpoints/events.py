@@ -1,17 +1,22 @@
+import os
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import raiseload
 from pathlib import Path
 
 from app.api import deps
 from app.db.session import get_db
 from app.models.models import Event as EventModel, User as UserModel, Notification as NotificationModel
 from app.schemas.event import Event, EventCreate, EventUpdate
+from app.utils.cache import cache_get, cache_set, cache_invalidate
 from app.websockets.manager import manager
 
 router = APIRouter()
 
+ALLOWED_IMAGE_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "webp"})
+
 @router.get("/", response_model=List[Event])
 async def read_events(
     db: AsyncSession = Depends(get_db),
@@ -22,12 +27,25 @@ async def read_events(
     """
     Retrieve events (filtered by college).
     """
-    query = select(EventModel)
+    scope = "all" if current_user.is_superuser else current_user.college_id
+    cache_key = f"events:{scope}:{skip}:{limit}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Event responses never touch relationships; make any accidental
+    # lazy load inside serialization fail loudly instead of emitting a
+    # hidden per-row SELECT.
+    query = select(EventModel).options(raiseload("*"))
     if not current_user.is_superuser:
         query = query.where(EventModel.college_id == current_user.college_id)
         
     result = await db.execute(query.offset(skip).limit(limit))
-    return result.scalars().all()
+
+    # Serialize once; the same payload feeds the cache and the response
+    events = [Event.model_validate(e).model_dump(mode="json") for e in result.scalars()]
+    await cache_set(cache_key, events)
+    return events
 
 @router.post("/", response_model=Event)
 async def create_event(
@@ -44,30 +62,25 @@ async def create_event(
         organizer_id=current_user.id,
         college_id=current_user.college_id
     )
-    db.add(db_obj)
+    new_notif = NotificationModel(
+        title="New Event!",
+        message=f"{event_in.title} has been organized by {current_user.full_name}",
+        type="info"
+    )
+    db.add_all([db_obj, new_notif])
+    await db.flush()  # populates both IDs via INSERT ... RETURNING
     await db.commit()
-    await db.refresh(db_obj)
-
-    # Broadcast notification
-    try:
-        new_notif = NotificationModel(
-            title="New Event!",
-            message=f"{db_obj.title} has been organized by {current_user.full_name}",
-            type="info"
-        )
-        db.add(new_notif)
-        await db.commit()
-        await db.refresh(new_notif)
-
-        await manager.broadcast({
-            "type": "notification",
-            "title": new_notif.title,
-            "message": new_notif.message,
-            "notif_type": new_notif.type,
-            "id": new_notif.id
-        })
-    except Exception as e:
-        print(f"Notification Error: {e}")
+    await cache_invalidate("events:")
+
+    # Broadcast notification; queued so the POST doesn't wait on
+    # subscriber fan-out
+    manager.broadcast_nowait({
+        "type": "notification",
+        "title": new_notif.title,
+        "message": new_notif.message,
+        "notif_type": new_notif.type,
+        "id": new_notif.id
+    })
 
     return db_obj
 
@@ -123,7 +136,7 @@ async def update_event(
     
     db.add(event)
     await db.commit()
-    await db.refresh(event)
+    await cache_invalidate("events:")
     return event
 
 @router.delete("/{id}", response_model=Event)
@@ -145,6 +158,7 @@ async def delete_event(
     
     await db.delete(event)
     await db.commit()
+    await cache_invalidate("events:")
     return event
 
 @router.post("/{id}/image", response_model=Event)
@@ -159,8 +173,9 @@ async def upload_event_image(
     Upload an image for an event.
     Image uploaded to: events/{event_id}/image_{timestamp}
     """
-    from app.utils.storage import storage
-    
+    from app.utils.storage import storage, MAX_UPLOAD_BYTES
+    from app.utils.uploads import iter_upload_chunks, save_upload_local, sniff_upload
+
     result = await db.execute(select(EventModel).where(EventModel.id == id))
     event = result.scalar_one_or_none()
     if not event:
@@ -170,34 +185,32 @@ async def upload_event_image(
     if not current_user.is_superuser and event.organizer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    file_extension = file.filename.split(".")[-1].lower()
-    if file_extension not in ["jpg", "jpeg", "png", "webp"]:
+    file_extension = os.path.splitext(file.filename)[1][1:].lower()
+    if file_extension not in ALLOWED_IMAGE_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Invalid file type. Only JPG/PNG/WEBP allowed.")
-    
-    # Read file content
-    contents = await file.read()
+    if not await sniff_upload(file):
+        raise HTTPException(status_code=400, detail="File content does not match an allowed image type.")
+    if file.size and file.size > MAX_UPLOAD_BYTES["event"]:
+        raise HTTPException(status_code=413, detail="File too large. Maximum size is 8MB.")
     
     # Try to upload to Supabase
-    image_url = storage.upload_event_image(
-        event_id=event.id,
-        organizer_id=event.organizer_id,
-        file_path=file.filename,
-        file_content=contents
-    )
-    
+    image_url = None
+    if storage.is_configured():
+        image_url = await storage.upload_event_image(
+            event_id=event.id,
+            file_path=file.filename,
+            file_content=iter_upload_chunks(file)
+        )
+
     # Fallback to local storage if Supabase is not configured
     if image_url is None:
-        upload_dir = Path("static/events")
-        upload_dir.mkdir(parents=True, exist_ok=True)
         file_name = f"event_{event.id}.{file_extension}"
-        file_path = upload_dir / file_name
-        with file_path.open("wb") as buffer:
-            buffer.write(contents)
+        await save_upload_local(file, Path("static/events") / file_name)
         image_url = f"/static/events/{file_name}"
     
     event.image_url = image_url
     db.add(event)
     await db.commit()
-    await db.refresh(event)
+    await cache_invalidate("events:")
     return event
 
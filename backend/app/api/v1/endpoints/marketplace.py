@@ -1,3 +1,4 @@
+import os
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,11 +8,29 @@ from pathlib import Path
 from app.api import deps
 from app.db.session import get_db
 from app.models.models import MarketplaceItem as MIModel, User as UserModel
+from app.utils.cache import cache_get, cache_set, cache_invalidate
 from pydantic import BaseModel
 from datetime import datetime
 
 router = APIRouter()
 
+ALLOWED_IMAGE_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "webp"})
+
+# Columns needed by MIResponse, selected directly so list pages skip ORM
+# object materialization entirely.
+_ITEM_COLUMNS = (
+    MIModel.id,
+    MIModel.owner_id,
+    MIModel.title,
+    MIModel.description,
+    MIModel.price,
+    MIModel.category,
+    MIModel.image_url,
+    MIModel.is_available,
+    MIModel.created_at,
+    UserModel.full_name.label("owner_name"),
+)
+
 class MIResponse(BaseModel):
     id: int
     owner_id: int
@@ -34,19 +53,23 @@ async def read_items(
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
+    cache_key = f"marketplace:{skip}:{limit}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     result = await db.execute(
-        select(MIModel, UserModel.full_name)
+        select(*_ITEM_COLUMNS)
         .join(UserModel, MIModel.owner_id == UserModel.id)
         .where(MIModel.is_available == True)
         .offset(skip).limit(limit)
     )
-    
-    items = []
-    for row in result:
-        item, owner_name = row
-        item_dict = MIResponse.model_validate(item)
-        item_dict.owner_name = owner_name
-        items.append(item_dict)
+
+    # model_construct skips validation; these values come straight from
+    # typed columns the schema mirrors
+    items = [MIResponse.model_construct(**row) for row in result.mappings()]
+
+    await cache_set(cache_key, [i.model_dump(mode="json") for i in items])
     return items
 
 @router.post("/", response_model=MIResponse)
@@ -64,9 +87,22 @@ async def create_item(
     Create a marketplace item.
     Image uploaded to: marketplace/{user_id}/items/{item_id}/{filename}
     """
-    from app.utils.storage import storage
-    
-    # Create item first (without image URL) to get the ID
+    from app.utils.storage import storage, MAX_UPLOAD_BYTES
+    from app.utils.uploads import iter_upload_chunks, save_upload_local, sniff_upload
+
+    # Validate the file before touching the database so a bad upload
+    # never leaves a half-created item behind
+    if file:
+        ext = os.path.splitext(file.filename)[1][1:].lower()
+        if ext not in ALLOWED_IMAGE_EXTENSIONS:
+            raise HTTPException(status_code=400, detail="Invalid file type. Only JPG/PNG/WEBP allowed.")
+        if not await sniff_upload(file):
+            raise HTTPException(status_code=400, detail="File content does not match an allowed image type.")
+        if file.size and file.size > MAX_UPLOAD_BYTES["marketplace"]:
+            raise HTTPException(status_code=413, detail="File too large. Maximum size is 8MB.")
+
+    # Commit the item first: the upload can take seconds, and an open
+    # transaction would pin its pooled connection the whole time
     db_obj = MIModel(
         owner_id=current_user.id,
         title=title,
@@ -77,40 +113,32 @@ async def create_item(
     )
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
-    
+
     # Now upload image if provided
     if file:
-        ext = file.filename.split(".")[-1].lower()
-        if ext not in ["jpg", "jpeg", "png", "webp"]:
-            raise HTTPException(status_code=400, detail="Invalid file type. Only JPG/PNG/WEBP allowed.")
-        
-        contents = await file.read()
-        
         # Try to upload to Supabase
-        image_url = storage.upload_marketplace_item(
-            user_id=current_user.id,
-            item_id=db_obj.id,
-            file_path=file.filename,
-            file_content=contents
-        )
-        
+        image_url = None
+        if storage.is_configured():
+            image_url = await storage.upload_marketplace_item(
+                user_id=current_user.id,
+                item_id=db_obj.id,
+                file_path=file.filename,
+                file_content=iter_upload_chunks(file)
+            )
+
         # Fallback to local storage if Supabase is not configured
         if image_url is None:
-            upload_dir = Path("static/marketplace")
-            upload_dir.mkdir(parents=True, exist_ok=True)
             safe_name = f"{current_user.id}_{file.filename}"
             image_path = f"static/marketplace/{safe_name}"
-            with open(image_path, "wb") as buffer:
-                buffer.write(contents)
+            await save_upload_local(file, Path(image_path))
             image_url = image_path.replace("\\", "/")
-        
-        # Update item with image URL
+
+        # Short follow-up write for the URL
         db_obj.image_url = image_url
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
-    
+
+    await cache_invalidate("marketplace:")
     return db_obj
 
 @router.delete("/{id}")
@@ -130,4 +158,5 @@ async def delete_item(
         
     await db.delete(item)
     await db.commit()
+    await cache_invalidate("marketplace:")
     return {"message": "Item deleted"}
@@ -1,7 +1,8 @@
+import os
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import insert, select
 from pathlib import Path
 
 from app.api import deps
@@ -12,6 +13,28 @@ from app.schemas.user import User, UserCreate, UserUpdate
 
 router = APIRouter()
 
+ALLOWED_IMAGE_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "webp"})
+
+# Columns matching the User response schema; hashed_password never leaves
+# the database on the list path.
+_USER_COLUMNS = (
+    UserModel.id,
+    UserModel.email,
+    UserModel.is_active,
+    UserModel.is_superuser,
+    UserModel.full_name,
+    UserModel.phone_number,
+    UserModel.address,
+    UserModel.interests,
+    UserModel.college_name,
+    UserModel.profile_image_url,
+    UserModel.theme_preference,
+    UserModel.college_id,
+    UserModel.role,
+    UserModel.events_count,
+    UserModel.buddies_count,
+)
+
 @router.post("/", response_model=User)
 async def create_user(
     *,
@@ -39,67 +62,56 @@ async def create_user(
             raise HTTPException(status_code=400, detail="Invalid invite code")
         college_id = college.id
 
-    db_obj = UserModel(
-        email=user_in.email,
-        hashed_password=security.get_password_hash(user_in.password),
-        full_name=user_in.full_name,
-        is_superuser=user_in.is_superuser,
-        college_id=college_id,
-        role="student" if not user_in.is_superuser else "super_admin"
+    hashed_password = await security.get_password_hash_async(user_in.password)
+
+    # INSERT ... RETURNING hands back the row with its server defaults
+    # in the same round-trip, so no refresh is needed
+    stmt = (
+        insert(UserModel)
+        .values(
+            email=user_in.email,
+            hashed_password=hashed_password,
+            full_name=user_in.full_name,
+            is_superuser=user_in.is_superuser,
+            college_id=college_id,
+            role="student" if not user_in.is_superuser else "super_admin",
+        )
+        .returning(UserModel)
     )
-    db.add(db_obj)
+    db_obj = (await db.execute(stmt)).scalar_one()
     await db.commit()
-    await db.refresh(db_obj)
     return db_obj
 
 @router.get("/", response_model=List[User])
 async def read_users(
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_college_admin),
-    skip: int = 0,
+    after_id: int = 0,
     limit: int = 100,
 ) -> Any:
     """
     Retrieve users (filtered by college for college admins).
+
+    Paginated by keyset: pass the last seen user ID as `after_id` to get
+    the next page, which stays O(1) where OFFSET degrades with depth.
     """
-    query = select(UserModel)
+    query = select(*_USER_COLUMNS).where(UserModel.id > after_id)
     if not current_user.is_superuser:
         query = query.where(UserModel.college_id == current_user.college_id)
-        
-    result = await db.execute(query.offset(skip).limit(limit))
-    return result.scalars().all()
+
+    result = await db.execute(query.order_by(UserModel.id).limit(limit))
+    return [User.model_construct(**row) for row in result.mappings()]
 
 @router.get("/me", response_model=User)
 async def read_user_me(
-    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get current user with stats.
-    """
-    from app.models.models import Participation
-
-    # Count events the user has joined
-    evt_stmt = select(func.count(Participation.id)).where(Participation.user_id == current_user.id)
-    evt_count = await db.execute(evt_stmt)
-    current_user.events_count = evt_count.scalar() or 0
-
-    # buddies_count: count of distinct other users who attended the same events
-    # build a subquery for all event IDs the current user participated in
-    subq = select(Participation.event_id).where(Participation.user_id == current_user.id).subquery()
-    buddy_stmt = (
-        select(func.count(func.distinct(Participation.user_id)))
-        .where(Participation.event_id.in_(subq))
-        .where(Participation.user_id != current_user.id)
-    )
-    buddy_count = await db.execute(buddy_stmt)
-    current_user.buddies_count = buddy_count.scalar() or 0
-
-    # persist the counters (optional caching/storage)
-    db.add(current_user)
-    await db.commit()
-    await db.refresh(current_user)
 
+    events_count and buddies_count are maintained by database triggers
+    on participations, so no aggregation runs here.
+    """
     return current_user
 
 @router.put("/me", response_model=User)
@@ -114,7 +126,7 @@ async def update_user_me(
     """
     update_data = user_in.dict(exclude_unset=True)
     if "password" in update_data:
-        update_data["hashed_password"] = security.get_password_hash(update_data["password"])
+        update_data["hashed_password"] = await security.get_password_hash_async(update_data["password"])
         del update_data["password"]
     
     for field in update_data:
@@ -122,7 +134,6 @@ async def update_user_me(
     
     db.add(current_user)
     await db.commit()
-    await db.refresh(current_user)
     return current_user
 
 @router.post("/me/profile-image", response_model=User)
@@ -136,37 +147,36 @@ async def upload_profile_image(
     Upload a profile image for the current user.
     Uploaded to: users/{user_id}/profile_picture/{filename}
     """
-    from app.utils.storage import storage
-    
-    file_extension = file.filename.split(".")[-1].lower()
-    if file_extension not in ["jpg", "jpeg", "png", "webp"]:
+    from app.utils.storage import storage, MAX_UPLOAD_BYTES
+    from app.utils.uploads import iter_upload_chunks, save_upload_local, sniff_upload
+
+    file_extension = os.path.splitext(file.filename)[1][1:].lower()
+    if file_extension not in ALLOWED_IMAGE_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Invalid file type. Only JPG/PNG/WEBP allowed.")
-    
-    # Read file content
-    contents = await file.read()
+    if not await sniff_upload(file):
+        raise HTTPException(status_code=400, detail="File content does not match an allowed image type.")
+    if file.size and file.size > MAX_UPLOAD_BYTES["profile"]:
+        raise HTTPException(status_code=413, detail="File too large. Maximum size is 5MB.")
     
     # Try to upload to Supabase
-    image_url = storage.upload_profile_image(
-        user_id=current_user.id,
-        file_path=file.filename,
-        file_content=contents
-    )
-    
+    image_url = None
+    if storage.is_configured():
+        image_url = await storage.upload_profile_image(
+            user_id=current_user.id,
+            file_path=file.filename,
+            file_content=iter_upload_chunks(file)
+        )
+
     # Fallback to local storage if Supabase is not configured
     if image_url is None:
-        upload_dir = Path("static/profile_images")
-        upload_dir.mkdir(parents=True, exist_ok=True)
         file_name = f"user_{current_user.id}.{file_extension}"
-        file_path = upload_dir / file_name
-        with file_path.open("wb") as buffer:
-            buffer.write(contents)
+        await save_upload_local(file, Path("static/profile_images") / file_name)
         image_url = f"/static/profile_images/{file_name}"
     
     current_user.profile_image_url = image_url
     
     db.add(current_user)
     await db.commit()
-    await db.refresh(current_user)
     return current_user
 
 @router.post("/join-college")
@@ -1,7 +1,8 @@
+import os
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import insert, select, update
 from pathlib import Path
 
 from app.api import deps
@@ -12,6 +13,20 @@ from datetime import datetime
 
 router = APIRouter()
 
+# Columns needed by VRResponse, selected directly so the admin list view
+# never hydrates full VerificationRequest rows.
+_VR_COLUMNS = (
+    VRModel.id,
+    VRModel.user_id,
+    VRModel.id_card_url,
+    VRModel.status,
+    VRModel.admin_note,
+    VRModel.created_at,
+    UserModel.full_name,
+)
+
+ALLOWED_DOCUMENT_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "pdf"})
+
 class VRResponse(BaseModel):
     id: int
     user_id: int
@@ -35,8 +50,9 @@ async def create_verification_request(
     Submit a new verification request.
     Document uploaded to: users/{user_id}/verification/{filename}
     """
-    from app.utils.storage import storage
-    
+    from app.utils.storage import storage, MAX_UPLOAD_BYTES
+    from app.utils.uploads import iter_upload_chunks, save_upload_local, sniff_upload
+
     # Check for existing pending request
     existing = await db.execute(
         select(VRModel).where(VRModel.user_id == current_user.id, VRModel.status == "pending")
@@ -45,34 +61,32 @@ async def create_verification_request(
         raise HTTPException(status_code=400, detail="A pending verification request already exists.")
 
     # Validate file type
-    ext = file.filename.split(".")[-1].lower()
-    if ext not in ["jpg", "jpeg", "png", "pdf"]:
+    ext = os.path.splitext(file.filename)[1][1:].lower()
+    if ext not in ALLOWED_DOCUMENT_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Invalid file type. Only JPG/PNG/PDF allowed.")
+    if not await sniff_upload(file, allow_pdf=True):
+        raise HTTPException(status_code=400, detail="File content does not match an allowed document type.")
+    if file.size and file.size > MAX_UPLOAD_BYTES["verification"]:
+        raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB.")
 
-    # Read file content
-    contents = await file.read()
-    
     # Try to upload to Supabase
-    id_card_url = storage.upload_verification_document(
-        user_id=current_user.id,
-        file_path=file.filename,
-        file_content=contents
-    )
-    
+    id_card_url = None
+    if storage.is_configured():
+        id_card_url = await storage.upload_verification_document(
+            user_id=current_user.id,
+            file_path=file.filename,
+            file_content=iter_upload_chunks(file)
+        )
+
     # Fallback to local storage if Supabase is not configured
     if id_card_url is None:
-        upload_dir = Path("static/verifications")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        file_path = upload_dir / f"id_{current_user.id}_{file.filename}"
-        with file_path.open("wb") as buffer:
-            buffer.write(contents)
+        file_path = Path("static/verifications") / f"id_{current_user.id}_{file.filename}"
+        await save_upload_local(file, file_path)
         id_card_url = str(file_path).replace("\\", "/")
         
-    db_obj = VRModel(
-        user_id=current_user.id,
-        id_card_url=id_card_url
+    await db.execute(
+        insert(VRModel).values(user_id=current_user.id, id_card_url=id_card_url)
     )
-    db.add(db_obj)
     await db.commit()
     return {"message": "Verification request submitted successfully"}
 
@@ -88,7 +102,7 @@ async def read_verification_requests(
     - College Admin sees only their college's student requests.
     """
     query = (
-        select(VRModel, UserModel.full_name)
+        select(*_VR_COLUMNS)
         .join(UserModel, VRModel.user_id == UserModel.id)
         .where(VRModel.status == status)
     )
@@ -97,15 +111,8 @@ async def read_verification_requests(
         query = query.where(UserModel.college_id == current_user.college_id)
 
     result = await db.execute(query)
-    
-    requests = []
-    for row in result:
-        vr, full_name = row
-        vr_dict = VRResponse.from_orm(vr)
-        vr_dict.full_name = full_name
-        requests.append(vr_dict)
-        
-    return requests
+
+    return [VRResponse.model_construct(**row) for row in result.mappings()]
 
 @router.post("/{id}/approve")
 async def approve_request(
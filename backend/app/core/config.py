@@ -10,9 +10,17 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-here"  # Change in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12  # work factor; raise to slow brute-force, lower for constrained CPUs
     
     DATABASE_URL: str
 
+    # Connection pool tuning; defaults sized for a single uvicorn worker
+    # under moderate concurrency.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+
     SUPABASE_URL: str
     SUPABASE_SERVICE_ROLE_KEY: str
     SUPABASE_BUCKET: str = "campus-storage"
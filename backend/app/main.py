@@ -1,12 +1,30 @@
+import asyncio
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.websockets.manager import manager
 
 from fastapi.staticfiles import StaticFiles
 import os
 
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with a Cache-Control header on every hit.
+
+    Starlette already serves these through FileResponse, which hands the
+    kernel the file path for zero-copy sendfile under uvicorn; the
+    header lets clients skip repeat requests for uploaded images
+    entirely.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", "public, max-age=3600")
+        return response
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
@@ -17,7 +35,7 @@ if not os.path.exists("static"):
     os.makedirs("static")
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 # Set all CORS enabled origins
 app.add_middleware(
@@ -30,6 +48,19 @@ app.add_middleware(
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+async def start_broadcast_tasks():
+    # Drain queued broadcasts and fan Redis-published ones out to this
+    # worker's websockets. The handles live on app.state because the
+    # loop only keeps weak references to tasks.
+    app.state.broadcaster_task = asyncio.create_task(manager.run_broadcaster())
+    app.state.pubsub_task = asyncio.create_task(manager.run_pubsub_listener())
+
+@app.on_event("shutdown")
+async def close_storage_client():
+    from app.utils.storage import storage
+    await storage.aclose()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to College Event API"}
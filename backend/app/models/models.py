@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Float, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -48,6 +48,8 @@ class User(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    # read_events filters every non-superuser request by college
+    __table_args__ = (Index("ix_events_college_id", "college_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -66,6 +68,11 @@ class Event(Base):
 
 class Participation(Base):
     __tablename__ = "participations"
+    # the /users/me counters look up by user and probe by event
+    __table_args__ = (
+        Index("ix_participations_user_id_event_id", "user_id", "event_id"),
+        Index("ix_participations_event_id", "event_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
@@ -131,6 +138,14 @@ class Notification(Base):
 
 class MarketplaceItem(Base):
     __tablename__ = "marketplace_items"
+    # partial index matching read_items' WHERE is_available filter
+    __table_args__ = (
+        Index(
+            "ix_marketplace_items_is_available",
+            "is_available",
+            postgresql_where=text("is_available"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
@@ -146,6 +161,8 @@ class MarketplaceItem(Base):
 
 class VerificationRequest(Base):
     __tablename__ = "verification_requests"
+    # the admin list view always filters by status
+    __table_args__ = (Index("ix_verification_requests_status", "status"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
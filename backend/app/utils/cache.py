@@ -0,0 +1,40 @@
+"""Short-TTL Redis response cache for hot list endpoints"""
+import json
+import logging
+from typing import Any, Optional
+
+from app.utils.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Cache entries are deliberately short-lived; they only need to absorb
+# request stampedes, not act as a source of truth.
+DEFAULT_TTL = 30
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Return the cached JSON payload for key, or None on miss/error."""
+    try:
+        cached = await redis_client.get(key)
+    except Exception:
+        logger.debug("cache get failed for %s", key, exc_info=True)
+        return None
+    return json.loads(cached) if cached else None
+
+
+async def cache_set(key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+    """Store a JSON-serializable payload under key. Errors are swallowed."""
+    try:
+        await redis_client.setex(key, ttl, json.dumps(value, default=str))
+    except Exception:
+        logger.debug("cache set failed for %s", key, exc_info=True)
+
+
+async def cache_invalidate(prefix: str) -> None:
+    """Drop every cache entry whose key starts with prefix."""
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=prefix + "*")]
+        if keys:
+            await redis_client.delete(*keys)
+    except Exception:
+        logger.debug("cache invalidate failed for %s", prefix, exc_info=True)
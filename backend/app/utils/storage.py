@@ -1,8 +1,9 @@
 """Supabase storage utility for file uploads and retrieval"""
+import logging
 import os
-import uuid
-from typing import Optional, TYPE_CHECKING
-from pathlib import Path
+from secrets import token_hex
+from typing import AsyncIterable, Optional, TYPE_CHECKING, Union
+import httpx
 
 if TYPE_CHECKING:
     from supabase import Client
@@ -12,195 +13,207 @@ try:
 except ImportError:
     create_client = None
 
+logger = logging.getLogger(__name__)
+
+def _ext(path: str) -> str:
+    """Lowercased extension (with dot) via a plain slice; no PurePath build"""
+    i = path.rfind(".")
+    return path[i:].lower() if i >= 0 else ""
+
+
+# MIME types by lowercased extension; built once instead of per call
+_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".pdf": "application/pdf",
+    ".gif": "image/gif",
+}
+
+_ALLOWED_EXT = frozenset(_CONTENT_TYPES)
+
+# Per-kind size caps. The endpoints reject oversized files up front via
+# UploadFile.size; _upload_at re-checks whole buffers and aborts
+# streamed bodies mid-flight as a backstop.
+MAX_UPLOAD_BYTES = {
+    "profile": 5 * 1024 * 1024,
+    "verification": 10 * 1024 * 1024,
+    "marketplace": 8 * 1024 * 1024,
+    "event": 8 * 1024 * 1024,
+}
+
+
+async def _capped(stream: AsyncIterable[bytes], max_bytes: int) -> AsyncIterable[bytes]:
+    """Re-yield a stream, aborting once it grows past max_bytes"""
+    total = 0
+    async for chunk in stream:
+        total += len(chunk)
+        if total > max_bytes:
+            raise ValueError(f"body exceeds {max_bytes} bytes")
+        yield chunk
+
 
 class SupabaseStorage:
     """Wrapper for Supabase storage operations"""
-    
+
+    # fixed-offset attribute access and no per-instance __dict__
+    __slots__ = ("url", "key", "bucket_name", "client", "_http", "_public_prefix")
+
     def __init__(self):
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
         self.bucket_name = os.getenv("SUPABASE_BUCKET", "campus-storage")
         self.client: Optional["Client"] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        # computed once; every successful upload builds a URL from it
+        self._public_prefix = (
+            f"{self.url}/storage/v1/object/public/{self.bucket_name}/" if self.url else ""
+        )
         
         if self.url and self.key and create_client:
             self.client = create_client(self.url, self.key)
 
+    def _get_http(self) -> httpx.AsyncClient:
+        """Lazily create the shared async client inside the event loop"""
+        if self._http is None:
+            # One pooled client for every upload: connections (and their
+            # TLS handshakes) are reused instead of re-established per
+            # request.
+            # HTTP/2 multiplexes concurrent uploads over one TLS
+            # connection, and the default Authorization header lets
+            # HPACK compress the long service-role JWT to a few bytes
+            # after the first request.
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                headers={"Authorization": f"Bearer {self.key}"},
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (app shutdown)"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _upload(
+        self,
+        storage_path: str,
+        file_content: Union[bytes, AsyncIterable[bytes]],
+        content_type: str,
+    ) -> None:
+        """
+        Send an object straight to the storage API without blocking the
+        loop. Accepts raw bytes or an async byte iterator; the latter is
+        streamed with chunked transfer encoding so memory stays bounded.
+        """
+        response = await self._get_http().post(
+            f"{self.url}/storage/v1/object/{self.bucket_name}/{storage_path}",
+            content=file_content,
+            headers={
+                "Content-Type": content_type,
+                # overwrite in place: one round-trip instead of
+                # delete-then-upload
+                "x-upsert": "true",
+            },
+        )
+        response.raise_for_status()
+
     
     def is_configured(self) -> bool:
         """Check if Supabase is properly configured"""
         return self.client is not None
     
-    def upload_profile_image(
-        self, 
-        user_id: int, 
-        file_path: str,
-        file_content: bytes
+    async def _upload_at(
+        self,
+        storage_path: str,
+        file_content: "Union[bytes, AsyncIterable[bytes]]",
+        ext: str,
+        kind: str,
     ) -> Optional[str]:
         """
-        Upload a profile picture to Supabase.
-        
-        Folder structure: users/{user_id}/profile_picture/{filename}
-        
-        Args:
-            user_id: The user ID
-            file_path: Original file path with extension
-            file_content: File content bytes
-            
-        Returns:
-            Public URL or None if upload fails
+        Shared upload path: send the object and return its public URL,
+        or None when storage is unconfigured, the file fails the
+        extension/size guards, or the request fails.
         """
         if not self.is_configured():
             return None
-            
+        if ext not in _ALLOWED_EXT:
+            logger.warning("Rejected upload %s: unsupported extension", storage_path)
+            return None
+        limit = MAX_UPLOAD_BYTES[kind]
+        if isinstance(file_content, bytes):
+            if len(file_content) > limit:
+                logger.warning("Rejected upload %s: larger than %d bytes", storage_path, limit)
+                return None
+        else:
+            # abort a streamed body mid-flight if it grows past the cap
+            file_content = _capped(file_content, limit)
+
         try:
-            ext = Path(file_path).suffix.lower()
-            filename = f"profile_picture{ext}"
-            storage_path = f"users/{user_id}/profile_picture/{filename}"
-            
-            # If old file exists, delete it
-            try:
-                self.client.storage.from_(self.bucket_name).remove([storage_path])
-            except:
-                pass
-            
-            # Upload new file
-            self.client.storage.from_(self.bucket_name).upload(
-                storage_path,
-                file_content,
-                file_options={"content-type": self._get_content_type(ext)}
-            )
-            
-            # Get public URL
+            await self._upload(storage_path, file_content, self._get_content_type(ext))
             return self._get_public_url(storage_path)
-        except Exception as e:
-            print(f"Error uploading profile image: {e}")
+        except Exception:
+            logger.exception("Error uploading %s", storage_path)
             return None
+
+    async def upload_profile_image(
+        self, 
+        user_id: int, 
+        file_path: str,
+        file_content: "Union[bytes, AsyncIterable[bytes]]"
+    ) -> Optional[str]:
+        """
+        Upload a profile picture to users/{user_id}/profile_picture/;
+        x-upsert overwrites any previous picture at the same path.
+        """
+        ext = _ext(file_path)
+        storage_path = f"users/{user_id}/profile_picture/profile_picture{ext}"
+        return await self._upload_at(storage_path, file_content, ext, "profile")
     
-    def upload_verification_document(
+    async def upload_verification_document(
         self,
         user_id: int,
         file_path: str,
-        file_content: bytes
+        file_content: "Union[bytes, AsyncIterable[bytes]]"
     ) -> Optional[str]:
         """
-        Upload a verification document (ID card) to Supabase.
-        
-        Folder structure: users/{user_id}/verification/{filename}
-        
-        Args:
-            user_id: The user ID
-            file_path: Original file path with extension
-            file_content: File content bytes
-            
-        Returns:
-            Public URL or None if upload fails
+        Upload a verification document (ID card) to a unique name under
+        users/{user_id}/verification/.
         """
-        if not self.is_configured():
-            return None
-            
-        try:
-            ext = Path(file_path).suffix.lower()
-            unique_name = f"id_card_{uuid.uuid4().hex}{ext}"
-            storage_path = f"users/{user_id}/verification/{unique_name}"
-            
-            # Upload file
-            self.client.storage.from_(self.bucket_name).upload(
-                storage_path,
-                file_content,
-                file_options={"content-type": self._get_content_type(ext)}
-            )
-            
-            # Get public URL
-            return self._get_public_url(storage_path)
-        except Exception as e:
-            print(f"Error uploading verification document: {e}")
-            return None
+        ext = _ext(file_path)
+        storage_path = f"users/{user_id}/verification/id_card_{token_hex(16)}{ext}"
+        return await self._upload_at(storage_path, file_content, ext, "verification")
     
-    def upload_marketplace_item(
+    async def upload_marketplace_item(
         self,
         user_id: int,
         item_id: int,
         file_path: str,
-        file_content: bytes
+        file_content: "Union[bytes, AsyncIterable[bytes]]"
     ) -> Optional[str]:
         """
-        Upload a marketplace item image to Supabase.
-        
-        Folder structure: marketplace/{user_id}/items/{item_id}/{filename}
-        
-        Args:
-            user_id: The user ID (owner)
-            item_id: The marketplace item ID
-            file_path: Original file path with extension
-            file_content: File content bytes
-            
-        Returns:
-            Public URL or None if upload fails
+        Upload a marketplace item image to
+        marketplace/{user_id}/items/{item_id}/.
         """
-        if not self.is_configured():
-            return None
-            
-        try:
-            ext = Path(file_path).suffix.lower()
-            filename = f"item_image{ext}"
-            storage_path = f"marketplace/{user_id}/items/{item_id}/{filename}"
-            
-            # Upload file
-            self.client.storage.from_(self.bucket_name).upload(
-                storage_path,
-                file_content,
-                file_options={"content-type": self._get_content_type(ext)}
-            )
-            
-            # Get public URL
-            return self._get_public_url(storage_path)
-        except Exception as e:
-            print(f"Error uploading marketplace item: {e}")
-            return None
+        ext = _ext(file_path)
+        storage_path = f"marketplace/{user_id}/items/{item_id}/item_image{ext}"
+        return await self._upload_at(storage_path, file_content, ext, "marketplace")
     
-    def upload_event_image(
+    async def upload_event_image(
         self,
         event_id: int,
-        organizer_id: int,
         file_path: str,
-        file_content: bytes
+        file_content: "Union[bytes, AsyncIterable[bytes]]"
     ) -> Optional[str]:
-        """
-        Upload an event image to Supabase.
-        
-        Folder structure: events/{event_id}/image_{timestamp}
-        
-        Args:
-            event_id: The event ID
-            organizer_id: The user ID (organizer)
-            file_path: Original file path with extension
-            file_content: File content bytes
-            
-        Returns:
-            Public URL or None if upload fails
-        """
-        if not self.is_configured():
-            return None
-            
-        try:
-            ext = Path(file_path).suffix.lower()
-            filename = f"event_image{ext}"
-            storage_path = f"events/{event_id}/{filename}"
-            
-            # Upload file
-            self.client.storage.from_(self.bucket_name).upload(
-                storage_path,
-                file_content,
-                file_options={"content-type": self._get_content_type(ext)}
-            )
-            
-            # Get public URL
-            return self._get_public_url(storage_path)
-        except Exception as e:
-            print(f"Error uploading event image: {e}")
-            return None
+        """Upload an event image to events/{event_id}/"""
+        ext = _ext(file_path)
+        storage_path = f"events/{event_id}/event_image{ext}"
+        return await self._upload_at(storage_path, file_content, ext, "event")
     
-    def delete_file(self, storage_path: str) -> bool:
+    async def delete_file(self, storage_path: str) -> bool:
         """
         Delete a file from storage.
         
@@ -214,27 +227,23 @@ class SupabaseStorage:
             return False
             
         try:
-            self.client.storage.from_(self.bucket_name).remove([storage_path])
+            response = await self._get_http().delete(
+                f"{self.url}/storage/v1/object/{self.bucket_name}/{storage_path}",
+            )
+            response.raise_for_status()
             return True
-        except Exception as e:
-            print(f"Error deleting file: {e}")
+        except Exception:
+            logger.exception("Error deleting file")
             return False
     
     def _get_public_url(self, storage_path: str) -> str:
         """Construct public URL for a file"""
-        return f"{self.url}/storage/v1/object/public/{self.bucket_name}/{storage_path}"
+        return self._public_prefix + storage_path
     
-    def _get_content_type(self, extension: str) -> str:
-        """Get MIME type based on file extension"""
-        content_types = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".webp": "image/webp",
-            ".pdf": "application/pdf",
-            ".gif": "image/gif",
-        }
-        return content_types.get(extension.lower(), "application/octet-stream")
+    @staticmethod
+    def _get_content_type(extension: str) -> str:
+        """Get MIME type based on file extension (already lowercased by callers)"""
+        return _CONTENT_TYPES.get(extension, "application/octet-stream")
 
 
 # Create a singleton instance
@@ -0,0 +1,62 @@
+"""Helpers shared by the file-upload endpoints"""
+import asyncio
+
+import aiofiles
+from pathlib import Path
+from fastapi import UploadFile
+
+# Uploads are streamed in 1 MiB pieces so per-request memory stays
+# bounded regardless of file size.
+CHUNK_SIZE = 1 << 20
+
+# Magic numbers packed as big-endian integers: one comparison per format
+# instead of trusting the attacker-controlled filename extension.
+_JPEG_PREFIX = 0xFFD8FF  # first three bytes
+_PNG_MAGIC = 0x89504E47
+_RIFF_MAGIC = 0x52494646  # "RIFF"; WEBP repeats at offset 8
+_PDF_MAGIC = 0x25504446  # "%PDF"
+
+
+async def sniff_upload(file: UploadFile, allow_pdf: bool = False) -> bool:
+    """
+    Check an upload's leading bytes against the allowed signatures
+    (JPEG/PNG/WEBP, plus PDF when allowed) and rewind the file.
+    """
+    head = await file.read(12)
+    await file.seek(0)
+    if len(head) < 4:
+        return False
+    word = int.from_bytes(head[:4], "big")
+    if word >> 8 == _JPEG_PREFIX or word == _PNG_MAGIC:
+        return True
+    if word == _RIFF_MAGIC and head[8:12] == b"WEBP":
+        return True
+    return allow_pdf and word == _PDF_MAGIC
+
+
+async def iter_upload_chunks(file: UploadFile):
+    """
+    Yield the upload in CHUNK_SIZE pieces, rewinding first.
+
+    Lets a storage backend stream the body (chunked transfer encoding)
+    without the endpoint ever materializing the whole file in memory.
+    """
+    await file.seek(0)
+    while chunk := await file.read(CHUNK_SIZE):
+        yield chunk
+
+
+async def save_upload_local(file: UploadFile, dest: Path) -> None:
+    """
+    Stream an upload to a local path chunk by chunk.
+
+    Rewinds the file first, so it works both for fresh uploads and for
+    files already consumed by a storage-backend attempt. Directory
+    creation runs in a worker thread; stat calls on a cold filesystem
+    would otherwise block the event loop.
+    """
+    await asyncio.to_thread(dest.parent.mkdir, parents=True, exist_ok=True)
+    await file.seek(0)
+    async with aiofiles.open(dest, "wb") as out:
+        while chunk := await file.read(CHUNK_SIZE):
+            await out.write(chunk)
@@ -1,6 +1,16 @@
 from typing import Dict, List, Set
 from fastapi import WebSocket
+import asyncio
 import json
+import logging
+
+from app.utils.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# All workers publish broadcasts here; each worker's listener fans the
+# message out to its own sockets, so multi-worker uvicorn stays correct.
+BROADCAST_CHANNEL = "ws:broadcast"
 
 class ConnectionManager:
     def __init__(self):
@@ -8,6 +18,8 @@ class ConnectionManager:
         self.active_connections: Dict[int, List[WebSocket]] = {}
         # channel_name -> set of user ids
         self.channels: Dict[str, Set[int]] = {}
+        # pending broadcasts, drained by run_broadcaster
+        self._queue: asyncio.Queue = asyncio.Queue()
 
     async def connect(self, websocket: WebSocket, user_id: int):
         await websocket.accept()
@@ -31,6 +43,22 @@ class ConnectionManager:
         # In a real-world app, we'd only send to users joined to this channel
         # For simplicity in this campus app, we can broadcast to all or filter
         # but let's implement a simple broadcast for now.
+        await self._local_broadcast(message)
+
+    async def broadcast(self, message: dict):
+        """
+        Publish to every connected client across all workers.
+
+        Goes through Redis Pub/Sub so each worker delivers to its own
+        sockets; if Redis is unreachable we degrade to this worker only.
+        """
+        try:
+            await redis_client.publish(BROADCAST_CHANNEL, json.dumps(message))
+        except Exception:
+            logger.warning("Redis publish failed, broadcasting locally", exc_info=True)
+            await self._local_broadcast(message)
+
+    async def _local_broadcast(self, message: dict):
         for connections in self.active_connections.values():
             for connection in connections:
                 try:
@@ -38,12 +66,46 @@ class ConnectionManager:
                 except:
                     pass
 
-    async def broadcast(self, message: dict):
-        for connections in self.active_connections.values():
-            for connection in connections:
+    def broadcast_nowait(self, message: dict) -> None:
+        """
+        Queue a broadcast and return immediately.
+
+        Request handlers use this so their latency never depends on how
+        many subscribers are connected or how slow they read.
+        """
+        self._queue.put_nowait(message)
+
+    async def run_broadcaster(self):
+        """Background task: deliver queued broadcasts one at a time"""
+        while True:
+            await self.broadcast(await self._queue.get())
+
+    async def run_pubsub_listener(self):
+        """
+        Background task: fan messages from Redis out to this worker's
+        sockets. Reconnects with a delay if the subscription drops.
+        """
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(BROADCAST_CHANNEL)
+                async for msg in pubsub.listen():
+                    if msg["type"] != "message":
+                        continue
+                    try:
+                        await self._local_broadcast(json.loads(msg["data"]))
+                    except Exception:
+                        logger.warning("Dropping malformed broadcast", exc_info=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Broadcast listener lost Redis, retrying", exc_info=True)
+                await asyncio.sleep(5)
+            finally:
+                # release the pooled connection before reconnecting
                 try:
-                    await connection.send_json(message)
-                except:
+                    await pubsub.aclose()
+                except Exception:
                     pass
 
 manager = ConnectionManager()
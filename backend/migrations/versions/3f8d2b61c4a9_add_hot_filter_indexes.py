@@ -0,0 +1,41 @@
+"""add_hot_filter_indexes
+
+Revision ID: 3f8d2b61c4a9
+Revises: 6e7851e41d90
+Create Date: 2026-09-01 10:14:22.517308
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8d2b61c4a9'
+down_revision: Union[str, Sequence[str], None] = '6e7851e41d90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_events_college_id', 'events', ['college_id'])
+    op.create_index('ix_participations_user_id_event_id', 'participations', ['user_id', 'event_id'])
+    op.create_index('ix_participations_event_id', 'participations', ['event_id'])
+    op.create_index(
+        'ix_marketplace_items_is_available',
+        'marketplace_items',
+        ['is_available'],
+        postgresql_where=sa.text('is_available'),
+    )
+    op.create_index('ix_verification_requests_status', 'verification_requests', ['status'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_verification_requests_status', table_name='verification_requests')
+    op.drop_index('ix_marketplace_items_is_available', table_name='marketplace_items')
+    op.drop_index('ix_participations_event_id', table_name='participations')
+    op.drop_index('ix_participations_user_id_event_id', table_name='participations')
+    op.drop_index('ix_events_college_id', table_name='events')
@@ -0,0 +1,90 @@
+"""maintain_participation_counters_with_triggers
+
+Revision ID: 9c5a7e10d2b4
+Revises: 3f8d2b61c4a9
+Create Date: 2026-09-01 11:02:48.290175
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c5a7e10d2b4'
+down_revision: Union[str, Sequence[str], None] = '3f8d2b61c4a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep users.events_count / buddies_count current from the database
+    # side so /users/me can read them without aggregating. The acting
+    # user gets both counters recomputed; co-participants of the touched
+    # event get their buddies_count refreshed since it depends on who
+    # else attends.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_participation_counters() RETURNS trigger AS $$
+        DECLARE
+            uid integer := COALESCE(NEW.user_id, OLD.user_id);
+            eid integer := COALESCE(NEW.event_id, OLD.event_id);
+        BEGIN
+            UPDATE users SET
+                events_count = (
+                    SELECT count(*) FROM participations WHERE user_id = uid
+                ),
+                buddies_count = (
+                    SELECT count(DISTINCT p2.user_id)
+                    FROM participations p1
+                    JOIN participations p2 ON p2.event_id = p1.event_id
+                    WHERE p1.user_id = uid AND p2.user_id <> uid
+                )
+            WHERE id = uid;
+
+            UPDATE users u SET
+                buddies_count = (
+                    SELECT count(DISTINCT p2.user_id)
+                    FROM participations p1
+                    JOIN participations p2 ON p2.event_id = p1.event_id
+                    WHERE p1.user_id = u.id AND p2.user_id <> u.id
+                )
+            WHERE u.id <> uid AND u.id IN (
+                SELECT user_id FROM participations WHERE event_id = eid
+            );
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_participations_counters
+        AFTER INSERT OR DELETE ON participations
+        FOR EACH ROW EXECUTE FUNCTION refresh_participation_counters()
+        """
+    )
+    # Backfill so existing rows start from correct values
+    op.execute(
+        """
+        UPDATE users u SET
+            events_count = (
+                SELECT count(*) FROM participations WHERE user_id = u.id
+            ),
+            buddies_count = (
+                SELECT count(DISTINCT p2.user_id)
+                FROM participations p1
+                JOIN participations p2 ON p2.event_id = p1.event_id
+                WHERE p1.user_id = u.id AND p2.user_id <> u.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_participations_counters ON participations")
+    op.execute("DROP FUNCTION IF EXISTS refresh_participation_counters()")